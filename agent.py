@@ -26,7 +26,9 @@ tools = [
         func=wrap_tool(tools_handler.search_restaurants),
         description=(
             "Search restaurants by name, city, cuisine, or minimum rating.\n"
-            "Input: JSON with optional keys: name (str), city (str), cuisine (str), min_rating (float).\n\n"
+            "Results are ranked exact matches first, then prefix matches, then substring matches.\n"
+            "Input: JSON with optional keys: name (str), city (str), cuisine (str), min_rating (float), "
+            "limit (int, default 20; the search stops once this many restaurants are found).\n\n"
             "Preferred prompt format:\n"
             "Find {cuisine} restaurants in {city} with rating above {min_rating}."
         )
@@ -100,6 +102,7 @@ tools = [
         func=wrap_tool(tools_handler.get_top_restaurants),
         description=(
             "Retrieve top-rated restaurants, optionally filtered by city.\n"
+            "Exact city matches are listed first, then prefix and substring city matches, up to limit.\n"
             "Input: JSON with optional keys: city (str), limit (int).\n\n"
             "Preferred prompt format:\n"
             "Show me the top {limit} restaurants in {city}."
@@ -126,6 +129,17 @@ tools = [
             "What are the FAQs for {restaurant_name} in {city}?"
         )
     ),
+    Tool(
+        name="search_faqs",
+        func=wrap_tool(tools_handler.search_faqs),
+        description=(
+            "Answer a specific question from a restaurant's FAQs; returns only the best-matching answers with scores.\n"
+            "Prefer this over get_faqs when the user asks a particular question.\n"
+            "Input: JSON with keys: restaurant_name (str), question (str), optional city (str), optional top_k (int).\n\n"
+            "Preferred prompt format:\n"
+            "Does {restaurant_name} in {city} have {question}?"
+        )
+    ),
     Tool(
         name="authenticate_user",
         func=wrap_tool(tools_handler.authenticate_user),
@@ -13,7 +13,14 @@ CREATE TABLE restaurants (
   phone VARCHAR(50),
   opening_hours TEXT,
   avg_cost_for_two INT,
-  image_url TEXT
+  image_url TEXT,
+  name_lower VARCHAR(255) GENERATED ALWAYS AS (LOWER(name)) STORED,
+  city_lower VARCHAR(100) GENERATED ALWAYS AS (LOWER(city)) STORED,
+  cuisine_lower VARCHAR(100) GENERATED ALWAYS AS (LOWER(cuisine)) STORED,
+  INDEX idx_restaurants_name_city (name_lower, city_lower),
+  INDEX idx_restaurants_city_rating (city_lower, rating),
+  INDEX idx_restaurants_cuisine_rating (cuisine_lower, rating),
+  INDEX idx_restaurants_rating (rating)
 );
 
 CREATE TABLE tables (
@@ -22,6 +29,7 @@ CREATE TABLE tables (
   table_number INT,
   capacity INT,
   is_available TINYINT DEFAULT 1,
+  INDEX idx_tables_restaurant_number (restaurant_id, table_number),
   FOREIGN KEY (restaurant_id) REFERENCES restaurants(id)
 );
 
@@ -44,6 +52,7 @@ CREATE TABLE bookings (
   status VARCHAR(50) DEFAULT 'booked',
   cancellation_reason TEXT,
   cancelled_at DATETIME,
+  INDEX idx_bookings_table_time (table_id, booking_time),
   FOREIGN KEY (restaurant_id) REFERENCES restaurants(id),
   FOREIGN KEY (table_id) REFERENCES tables(id)
 );
@@ -64,6 +73,8 @@ CREATE TABLE menus (
   price FLOAT,
   description TEXT,
   availability TINYINT DEFAULT 1,
+  item_name_lower VARCHAR(255) GENERATED ALWAYS AS (LOWER(item_name)) STORED,
+  INDEX idx_menus_restaurant_item (restaurant_id, item_name_lower),
   FOREIGN KEY (restaurant_id) REFERENCES restaurants(id)
 );
 
@@ -0,0 +1,99 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+# Words that carry no signal when matching a guest question to an FAQ
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "am", "was", "were", "be", "do", "does", "did",
+    "you", "your", "we", "our", "i", "me", "my", "it", "its", "there", "this", "that",
+    "of", "to", "in", "on", "at", "for", "with", "by", "from", "and", "or", "any",
+    "can", "have", "has", "what", "which", "how", "when", "where", "will", "would",
+    "could", "should", "please", "restaurant",
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str):
+    """Lowercase text and split it into index terms, dropping stopwords."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def normalize(text: str):
+    """Collapse case and whitespace so duplicate FAQ rows share one key."""
+    return " ".join(text.lower().split())
+
+
+class FAQIndex:
+    """In-memory TF-IDF index over deduplicated FAQ question/answer pairs.
+
+    Each distinct Q/A pair is stored once and remembers which restaurants
+    carry it, so searches can be scoped to one restaurant or a whole chain.
+    Rows are added incrementally; ``last_faq_id`` records the highest FAQ id
+    seen so callers only need to feed in newer rows.
+    """
+
+    def __init__(self):
+        self.docs = {}                          # key -> {"question", "answer", "tf"}
+        self.restaurants = defaultdict(set)     # key -> restaurant ids carrying the pair
+        self.by_restaurant = defaultdict(set)   # restaurant id -> keys
+        self.postings = defaultdict(set)        # term -> keys
+        self.df = Counter()
+        self.last_faq_id = 0
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, faq_id: int, restaurant_id: int, question: str, answer: str):
+        """Index one FAQ row, merging it into an existing pair if it is a duplicate."""
+        key = (normalize(question), normalize(answer))
+        if key not in self.docs:
+            tf = Counter(tokenize(question) + tokenize(answer))
+            self.docs[key] = {"question": question.strip(), "answer": answer.strip(), "tf": tf}
+            for term in tf:
+                self.df[term] += 1
+                self.postings[term].add(key)
+        self.restaurants[key].add(restaurant_id)
+        self.by_restaurant[restaurant_id].add(key)
+        if faq_id and faq_id > self.last_faq_id:
+            self.last_faq_id = faq_id
+
+    def idf(self, term: str):
+        return math.log((len(self.docs) + 1) / (self.df[term] + 1)) + 1
+
+    def weights(self, tf: Counter):
+        return {term: (1 + math.log(count)) * self.idf(term) for term, count in tf.items()}
+
+    def search(self, query: str, restaurant_ids=None, top_k: int = 3, min_score: float = 0.1):
+        """Return up to ``top_k`` pairs ranked by cosine similarity to ``query``.
+
+        Only pairs carried by ``restaurant_ids`` are considered when it is given.
+        """
+        query_tf = Counter(t for t in tokenize(query) if t in self.df)
+        if not query_tf:
+            return []
+
+        candidates = set()
+        for term in query_tf:
+            candidates |= self.postings[term]
+        if restaurant_ids is not None:
+            scoped = set()
+            for rid in restaurant_ids:
+                scoped |= self.by_restaurant.get(rid, set())
+            candidates &= scoped
+
+        query_weights = self.weights(query_tf)
+        query_norm = math.sqrt(sum(w * w for w in query_weights.values()))
+
+        results = []
+        for key in candidates:
+            doc = self.docs[key]
+            doc_weights = self.weights(doc["tf"])
+            doc_norm = math.sqrt(sum(w * w for w in doc_weights.values()))
+            dot = sum(w * doc_weights.get(term, 0.0) for term, w in query_weights.items())
+            score = dot / (query_norm * doc_norm)
+            if score >= min_score:
+                results.append({"question": doc["question"], "answer": doc["answer"], "score": round(score, 3)})
+
+        results.sort(key=lambda r: r["score"], reverse=True)
+        return results[:top_k]
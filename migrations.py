@@ -0,0 +1,217 @@
+"""Index migration and EXPLAIN check for the assistant's tool queries.
+
+    python migrations.py          # add lowercase lookup columns and indexes (idempotent)
+    python migrations.py --check  # EXPLAIN every match tier of the tool queries and flag full table scans
+
+Run ``--check`` as a separate invocation after migrating, so sqltool reflects the new columns.
+"""
+import argparse
+import logging
+import re
+import sys
+
+from sqlalchemy import event, text
+
+from sqltool import (
+    engine, session, RestaurantAssistantTools, Restaurant, Menu, User,
+    MATCH_TIERS, lower_column, match_filter,
+)
+
+logger = logging.getLogger(__name__)
+
+# "<table>.<column> LIKE %(param)s", optionally wrapped as lower(<table>.<column>)
+LIKE_RE = re.compile(r"(\w+)\.\w+\)?\s+LIKE\s+%\((\w+)\)s", re.IGNORECASE)
+
+# (table, column, type, source column): stored lowercase copies so lookups can use an index
+GENERATED_COLUMNS = [
+    ("restaurants", "name_lower", "VARCHAR(255)", "name"),
+    ("restaurants", "city_lower", "VARCHAR(100)", "city"),
+    ("restaurants", "cuisine_lower", "VARCHAR(100)", "cuisine"),
+    ("menus", "item_name_lower", "VARCHAR(255)", "item_name"),
+]
+
+# (table, index name, columns); skipped when an existing index already leads with the same columns
+INDEXES = [
+    ("restaurants", "idx_restaurants_name_city", ["name_lower", "city_lower"]),
+    ("restaurants", "idx_restaurants_city_rating", ["city_lower", "rating"]),
+    ("restaurants", "idx_restaurants_cuisine_rating", ["cuisine_lower", "rating"]),
+    ("restaurants", "idx_restaurants_rating", ["rating"]),
+    ("menus", "idx_menus_restaurant_item", ["restaurant_id", "item_name_lower"]),
+    ("tables", "idx_tables_restaurant_number", ["restaurant_id", "table_number"]),
+    ("bookings", "idx_bookings_table_time", ["table_id", "booking_time"]),
+    ("users", "idx_users_email", ["email"]),
+]
+
+
+def column_exists(conn, table, column):
+    return conn.execute(text(
+        "SELECT COUNT(*) FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND COLUMN_NAME = :column"
+    ), {"table": table, "column": column}).scalar() > 0
+
+
+def index_exists(conn, table, name, columns):
+    """True if ``name`` exists or another index on ``table`` starts with ``columns``."""
+    rows = conn.execute(text(
+        "SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table ORDER BY INDEX_NAME, SEQ_IN_INDEX"
+    ), {"table": table}).all()
+    indexes = {}
+    for index_name, column_name in rows:
+        indexes.setdefault(index_name, []).append(column_name)
+    if name in indexes:
+        return True
+    return any(existing[:len(columns)] == columns for existing in indexes.values())
+
+
+def migrate():
+    """Add the lowercase generated columns and composite indexes that the tool queries rely on."""
+    with engine.begin() as conn:
+        for table, column, column_type, source in GENERATED_COLUMNS:
+            if column_exists(conn, table, column):
+                continue
+            conn.execute(text(
+                f"ALTER TABLE {table} ADD COLUMN {column} {column_type} "
+                f"GENERATED ALWAYS AS (LOWER({source})) STORED"
+            ))
+            logger.info(f"Added generated column {table}.{column}")
+
+        for table, name, columns in INDEXES:
+            if index_exists(conn, table, name, columns):
+                continue
+            conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+            logger.info(f"Created index {name} on {table}({', '.join(columns)})")
+
+
+def tier_samples(value):
+    """Lookup values that drive a tiered match into each tier: the full value, a prefix and a middle substring."""
+    if not value or len(value) < 4:
+        return [value] if value else []
+    return [value, value[:3], value[1:-1]]
+
+
+def substring_scan_tables(statement, parameters):
+    """Return the tables this statement filters with a leading-wildcard LIKE (the substring tier).
+
+    Only those tables are expected to be fully scanned; any other full scan in the plan is flagged.
+    """
+    if not isinstance(parameters, dict):
+        return set()
+    return {
+        table for table, param in LIKE_RE.findall(statement)
+        if isinstance(parameters.get(param), str) and parameters[param].startswith("%")
+    }
+
+
+def explain_tool_queries(tools=None):
+    """EXPLAIN every match tier of each lookup plus the SELECTs the read-only tools issue.
+
+    Returns ``(flagged, known)``: plan rows doing an unexpected full table scan, and the
+    full scans that are expected (the substring fallback tier on the table it filters).
+    Raises LookupError when there are no restaurants to sample.
+    """
+    tools = tools or RestaurantAssistantTools(session)
+    restaurant = session.query(Restaurant).first()
+    if not restaurant:
+        raise LookupError("No restaurants to sample; load data first (python sqlfaker.py)")
+    menu_item = session.query(Menu).filter_by(restaurant_id=restaurant.id).first()
+    user = session.query(User).first()
+    # Load the FAQ index up front so the captured refresh query is the incremental one
+    tools.refresh_faq_index()
+
+    lookups = [
+        (session.query(Restaurant), lower_column(Restaurant, "name"), restaurant.name),
+        (session.query(Restaurant), lower_column(Restaurant, "city"), restaurant.city),
+        (session.query(Restaurant), lower_column(Restaurant, "cuisine"), restaurant.cuisine),
+    ]
+    if menu_item:
+        lookups.append((
+            session.query(Menu).filter_by(restaurant_id=restaurant.id),
+            lower_column(Menu, "item_name"),
+            menu_item.item_name,
+        ))
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        # Every tier explicitly, whether or not an earlier tier would have matched
+        for query, column, value in lookups:
+            for tier in MATCH_TIERS:
+                query.filter(match_filter(column, value, tier)).first()
+
+        # The tools themselves, with values that stop at each tier in turn
+        for name, city, cuisine in zip(tier_samples(restaurant.name), tier_samples(restaurant.city),
+                                       tier_samples(restaurant.cuisine)):
+            tools.search_restaurants(name=name, city=city)
+            tools.search_restaurants(city=city, min_rating=restaurant.rating, limit=5)
+            tools.search_restaurants(cuisine=cuisine)
+            tools.get_top_restaurants(city=city)
+            tools.get_menu(name, city)
+            tools.get_available_tables(name, city)
+        tools.get_top_restaurants()
+        tools.get_faqs(restaurant.name, restaurant.city)
+        tools.search_faqs(restaurant.name, "opening hours", restaurant.city)
+        if menu_item:
+            for item_name in tier_samples(menu_item.item_name):
+                tools.get_menu_item_by_name(restaurant.id, item_name)
+        if user:
+            # Same lookup authenticate_user does, without the password check
+            tools.session.query(User).filter_by(email=user.email).first()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    flagged, known = [], []
+    seen = set()
+    with engine.connect() as conn:
+        for statement, parameters in captured:
+            key = (statement, repr(parameters))
+            if key in seen:
+                continue
+            seen.add(key)
+            substring_tables = substring_scan_tables(statement, parameters)
+            for row in conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings():
+                if row["type"] != "ALL":
+                    continue
+                entry = {
+                    "query": " ".join(statement.split()),
+                    "params": parameters,
+                    "table": row["table"],
+                    "type": row["type"],
+                    "possible_keys": row["possible_keys"],
+                    "rows": row["rows"],
+                }
+                if row["table"] in substring_tables:
+                    entry["reason"] = "substring match tier"
+                    known.append(entry)
+                else:
+                    flagged.append(entry)
+    return flagged, known
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="EXPLAIN tool queries and flag full table scans")
+    args = parser.parse_args()
+
+    if not args.check:
+        migrate()
+        print("Migration completed!")
+        sys.exit(0)
+
+    try:
+        flagged, known = explain_tool_queries()
+    except LookupError as e:
+        print(f"No data to sample: {e}")
+        sys.exit(2)
+    for item in known:
+        print("expected:", item)
+    for item in flagged:
+        print("FULL SCAN:", item)
+    print(f"{len(known)} expected full scan(s) (substring fallback)")
+    print(f"{len(flagged)} tool query plan(s) doing an unexpected full table scan")
+    sys.exit(1 if flagged else 0)
@@ -8,6 +8,8 @@ import urllib.parse
 from dotenv import load_dotenv
 from passlib.context import CryptContext
 import logging
+import time
+from faqindex import FAQIndex
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -41,42 +43,128 @@ FAQ = Base.classes.faqs
 Review = Base.classes.reviews
 User = Base.classes.users
 
+# Per-row fingerprint used to notice FAQ rows that were updated, deleted or reseeded
+FAQ_ROW_CRC = func.crc32(func.concat_ws("|", FAQ.id, FAQ.restaurant_id, FAQ.question, FAQ.answer))
+
+# How often refresh_faq_index re-checksums the indexed FAQ rows to catch in-place UPDATEs
+FAQ_VERIFY_SECONDS = 15 * 60
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Text lookups try the index-friendly forms first and only fall back to a full scan
+MATCH_TIERS = ("exact", "prefix", "substring")
+
+# Lowercase generated columns added by migrations.py; internal to lookups, never returned to the agent
+LOOKUP_COLUMNS = {"name_lower", "city_lower", "cuisine_lower", "item_name_lower"}
+
 def model_to_dict(row):
-    """Convert SQLAlchemy model instance to dictionary."""
-    return {column.name: getattr(row, column.name) for column in row._table_.columns}
+    """Convert SQLAlchemy model instance to dictionary, leaving out the generated *_lower lookup columns."""
+    return {
+        column.name: getattr(row, column.name)
+        for column in row.__table__.columns
+        if column.name not in LOOKUP_COLUMNS
+    }
+
+def lower_column(model, name):
+    """Return the indexed lowercase generated column if migrations.py has added it, else LOWER(column)."""
+    column = getattr(model, f"{name}_lower", None)
+    return column if column is not None else func.lower(getattr(model, name))
+
+def match_filter(column, value, tier):
+    """Build a case-insensitive filter on a lowercase column for the given match tier."""
+    value = value.lower()
+    if tier == "exact":
+        return column == value
+    if tier == "prefix":
+        return column.like(f"{value}%")
+    return column.like(f"%{value}%")
 
 class RestaurantAssistantTools:
     def __init__(self, session):
         self.session = session
+        self.faq_index = FAQIndex()
+        self.faq_fingerprint = (0, 0)  # (row count, CRC32 sum) of the rows in faq_index
+        self.faq_verified_at = time.monotonic()
+
+    def match_tiered(self, query, filters, fetch):
+        """Run ``fetch`` with (column, value) filters applied as exact, then prefix, then substring matches.
+
+        Returns the first non-empty result, so the full-scan substring form only runs on a miss.
+        Within the prefix and substring tiers, rows matching individual columns exactly (then by
+        prefix) come first, so an exact name with a partial city still picks that restaurant.
+        """
+        filters = [(column, value) for column, value in filters if value]
+        if not filters:
+            return fetch(query)
+        result = None
+        for tier in MATCH_TIERS:
+            tiered = query.filter(*[match_filter(column, value, tier) for column, value in filters])
+            if tier != "exact":
+                tiered = tiered.order_by(
+                    *[match_filter(column, value, "exact").desc() for column, value in filters],
+                    *[match_filter(column, value, "prefix").desc() for column, value in filters],
+                )
+            result = fetch(tiered)
+            if result:
+                break
+        return result
+
+    def match_tiered_all(self, query, model, filters, order_by=None, limit: int = None):
+        """Collect rows matching (column, value) filters tier by tier: exact, then prefix, then substring.
+
+        Rows found by an earlier tier are excluded from later ones, so results come back ranked by
+        match quality. Stops once ``limit`` rows are found; without a limit every tier runs.
+        """
+        filters = [(column, value) for column, value in filters if value]
+        if not filters:
+            if order_by is not None:
+                query = query.order_by(order_by)
+            return query.limit(limit).all() if limit else query.all()
+        results = []
+        for tier in MATCH_TIERS:
+            tiered = query.filter(*[match_filter(column, value, tier) for column, value in filters])
+            if results:
+                tiered = tiered.filter(~model.id.in_([r.id for r in results]))
+            if order_by is not None:
+                tiered = tiered.order_by(order_by)
+            if limit:
+                tiered = tiered.limit(limit - len(results))
+            results.extend(tiered.all())
+            if limit and len(results) >= limit:
+                break
+        return results
 
     def get_restaurant_by_name(self, name: str, city: str = None):
-        name_lower = name.lower()
-        query = self.session.query(Restaurant).filter(func.lower(Restaurant.name).like(f"%{name_lower}%"))
-        if city:
-            city_lower = city.lower()
-            query = query.filter(func.lower(Restaurant.city).like(f"%{city_lower}%"))
-        return query.first()
+        return self.match_tiered(
+            self.session.query(Restaurant),
+            [(lower_column(Restaurant, "name"), name), (lower_column(Restaurant, "city"), city)],
+            lambda q: q.first(),
+        )
 
     def get_menu_item_by_name(self, restaurant_id: int, item_name: str):
-        item_name_lower = item_name.lower()
-        return self.session.query(Menu).filter_by(restaurant_id=restaurant_id).filter(
-            func.lower(Menu.item_name).like(f"%{item_name_lower}%")
-        ).first()
+        return self.match_tiered(
+            self.session.query(Menu).filter_by(restaurant_id=restaurant_id),
+            [(lower_column(Menu, "item_name"), item_name)],
+            lambda q: q.first(),
+        )
 
-    def search_restaurants(self, name: str = None, city: str = None, cuisine: str = None, min_rating: float = None):
+    def search_restaurants(self, name: str = None, city: str = None, cuisine: str = None,
+                           min_rating: float = None, limit: int = 20):
         query = self.session.query(Restaurant)
-        if name:
-            query = query.filter(func.lower(Restaurant.name).like(f"%{name.lower()}%"))
-        if city:
-            query = query.filter(func.lower(Restaurant.city).like(f"%{city.lower()}%"))
-        if cuisine:
-            query = query.filter(func.lower(Restaurant.cuisine).like(f"%{cuisine.lower()}%"))
         if min_rating:
             query = query.filter(Restaurant.rating >= min_rating)
-        return [model_to_dict(r) for r in query.all()]
+        restaurants = self.match_tiered_all(
+            query,
+            Restaurant,
+            [
+                (lower_column(Restaurant, "name"), name),
+                (lower_column(Restaurant, "city"), city),
+                (lower_column(Restaurant, "cuisine"), cuisine),
+            ],
+            limit=limit,
+        )
+        return [model_to_dict(r) for r in restaurants]
 
     def get_menu(self, restaurant_name: str, city: str = None):
         restaurant = self.get_restaurant_by_name(restaurant_name, city)
@@ -223,6 +311,85 @@ class RestaurantAssistantTools:
         faqs = self.session.query(FAQ).filter_by(restaurant_id=restaurant.id).all()
         return [model_to_dict(f) for f in faqs]
 
+    def reset_faq_index(self):
+        """Drop the local FAQ index so the next refresh rebuilds it from scratch."""
+        self.faq_index = FAQIndex()
+        self.faq_fingerprint = (0, 0)
+        self.faq_verified_at = time.monotonic()
+
+    def load_new_faqs(self):
+        """Index FAQ rows with an id above the last one indexed, keeping the fingerprint in step."""
+        rows = self.session.query(FAQ, FAQ_ROW_CRC).filter(
+            FAQ.id > self.faq_index.last_faq_id
+        ).order_by(FAQ.id).all()
+        count, checksum = self.faq_fingerprint
+        for f, crc in rows:
+            self.faq_index.add(f.id, f.restaurant_id, f.question, f.answer)
+            count += 1
+            checksum += int(crc)
+        self.faq_fingerprint = (count, checksum)
+        return len(rows)
+
+    def refresh_faq_index(self):
+        """Bring the local FAQ index up to date with the faqs table.
+
+        Each call only reads COUNT(*) and MAX(id): new ids are added incrementally, and a
+        lower count or max id (deleted or reseeded rows) triggers a rebuild. In-place UPDATEs
+        are caught by re-checksumming the indexed rows every FAQ_VERIFY_SECONDS.
+        """
+        # End the current read transaction so rows committed since the session's last query are visible
+        self.session.rollback()
+        count, max_id = self.session.query(func.count(FAQ.id), func.max(FAQ.id)).one()
+        max_id = max_id or 0
+
+        if max_id < self.faq_index.last_faq_id:
+            logger.info("FAQ rows were removed or reseeded, rebuilding the FAQ index")
+            self.reset_faq_index()
+        elif time.monotonic() - self.faq_verified_at > FAQ_VERIFY_SECONDS:
+            indexed_count, checksum = self.session.query(func.count(FAQ.id), func.sum(FAQ_ROW_CRC)).filter(
+                FAQ.id <= self.faq_index.last_faq_id
+            ).one()
+            self.faq_verified_at = time.monotonic()
+            if (indexed_count, int(checksum or 0)) != self.faq_fingerprint:
+                logger.info("FAQ rows changed since the last check, rebuilding the FAQ index")
+                self.reset_faq_index()
+
+        if (count, max_id) == (self.faq_fingerprint[0], self.faq_index.last_faq_id):
+            return
+        added = self.load_new_faqs()
+        if self.faq_fingerprint[0] != count:
+            # Rows below last_faq_id were deleted; the surviving set is only known after a full reload
+            logger.info("FAQ row count does not match the index, rebuilding the FAQ index")
+            self.reset_faq_index()
+            added = self.load_new_faqs()
+        if added:
+            logger.info(f"Indexed {added} new FAQ rows ({len(self.faq_index)} unique Q/A pairs)")
+
+    def search_faqs(self, restaurant_name: str, question: str, city: str = None, top_k: int = 3):
+        """Answer a question from the restaurant's FAQs, falling back to its chain's FAQs."""
+        try:
+            self.refresh_faq_index()
+            restaurant = self.get_restaurant_by_name(restaurant_name, city)
+            if not restaurant:
+                return {"error": "Restaurant not found"}
+
+            matches = self.faq_index.search(question, restaurant_ids=[restaurant.id], top_k=top_k)
+            scope = "restaurant"
+            if not matches:
+                chain_ids = [r.id for r in self.session.query(Restaurant.id).filter(
+                    match_filter(lower_column(Restaurant, "name"), restaurant.name, "exact"),
+                    Restaurant.id != restaurant.id,
+                ).all()]
+                if chain_ids:
+                    matches = self.faq_index.search(question, restaurant_ids=chain_ids, top_k=top_k)
+                    scope = "chain"
+            if not matches:
+                return {"message": "No matching FAQ found", "restaurant": restaurant.name}
+            return {"restaurant": restaurant.name, "scope": scope, "faqs": matches}
+        except Exception as e:
+            logger.error(f"Error searching FAQs: {e}")
+            return {"error": str(e)}
+
     def authenticate_user(self, email: str, password: str):
         try:
             user = self.session.query(User).filter_by(email=email).first()
@@ -237,11 +404,13 @@ class RestaurantAssistantTools:
     def get_top_restaurants(self, city: str = None, limit: int = 5):
         """Get top N restaurants by rating in a given city (if provided)."""
         try:
-            query = self.session.query(Restaurant)
-            if city:
-                query = query.filter(func.lower(Restaurant.city).like(f"%{city.lower()}%"))
-            query = query.order_by(Restaurant.rating.desc()).limit(limit)
-            top_restaurants = query.all()
+            top_restaurants = self.match_tiered_all(
+                self.session.query(Restaurant),
+                Restaurant,
+                [(lower_column(Restaurant, "city"), city)],
+                order_by=Restaurant.rating.desc(),
+                limit=limit,
+            )
             return [model_to_dict(r) for r in top_restaurants]
         except Exception as e:
             logger.error(f"Error fetching top restaurants: {e}")